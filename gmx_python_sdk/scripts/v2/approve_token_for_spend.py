@@ -1,11 +1,86 @@
-import json
+import logging
 import os
 
+from eth_abi import encode
 from web3 import Web3
 
 from .gmx_utils import (
-    create_connection, base_dir, convert_to_checksum_address
+    create_connection, base_dir, convert_to_checksum_address,
+    get_multicall3_contract, multicall3_aggregate, load_abi, build_transaction_params,
+    sign_and_send_transaction, to_checksum_address, nonce_manager
 )
+from .gas_utils import get_max_priority_fee
+
+logger = logging.getLogger(__name__)
+
+# WETH on Arbitrum, approvals of which are checked against the native ETH balance
+WETH_ARBITRUM_ADDRESS = Web3.to_checksum_address("0x82aF49447D8a07e3bd95BD0d56f35241523fBab1")
+
+# Token addresses which need to be approved under a different address
+BTC_INDEX_TOKEN_ADDRESS = Web3.to_checksum_address("0x47904963fc8b2340414262125aF798B9655E58Cd")
+WBTC_ADDRESS = Web3.to_checksum_address("0x2f2a2543B76A4166549F7aaB2e75Bef0aefC5B0f")
+
+# An ERC20 approve costs ~50k gas, so this leaves headroom without over-reserving
+APPROVE_GAS_LIMIT = 100_000
+
+# 4 byte selector of the ERC20 approve(address,uint256) function
+APPROVE_SELECTOR = bytes(Web3.keccak(text="approve(address,uint256)")[:4])
+
+# Allowance still available to spend, keyed by (wallet, token, spender). Each time an amount is
+# checked it is deducted from the entry, since the order that follows will spend it, so the cache
+# only ever under-estimates the on-chain allowance.
+_ALLOWANCE_CACHE = {}
+
+
+def invalidate_allowance(wallet: str, token: str, spender: str):
+    """
+    Drop the cached allowance for a wallet, token and spender, forcing the next call to
+    check_if_approved to read balance and allowance from chain again. Use this if a transfer fails.
+
+    Parameters
+    ----------
+    wallet : str
+        address of the token owner.
+    token : str
+        contract address of the token.
+    spender : str
+        contract address of the spender.
+
+    """
+    _ALLOWANCE_CACHE.pop(
+        (
+            to_checksum_address(wallet),
+            to_checksum_address(token),
+            to_checksum_address(spender)
+        ),
+        None
+    )
+
+
+def _build_approve_transaction(
+        config,
+        token: str,
+        spender: str,
+        amount: int,
+        max_fee_per_gas: float,
+        max_priority_fee_per_gas: int,
+        nonce: int):
+    """
+    Build an ERC20 approve transaction from its static calldata, without going through the web3
+    contract abstraction.
+    """
+    raw_txn = build_transaction_params(
+        config,
+        value=0,
+        gas=APPROVE_GAS_LIMIT,
+        max_fee_per_gas=max_fee_per_gas,
+        max_priority_fee_per_gas=max_priority_fee_per_gas,
+        nonce=nonce
+    )
+    raw_txn['to'] = token
+    raw_txn['data'] = APPROVE_SELECTOR + encode(['address', 'uint256'], [spender, amount])
+
+    return raw_txn
 
 
 def check_if_approved(
@@ -43,111 +118,122 @@ def check_if_approved(
     # Establish a connection to the blockchain
     connection = create_connection(config)
 
-    # Handle specific cases for known token mappings
-    if token_to_approve == "0x47904963fc8b2340414262125aF798B9655E58Cd":
-        print("[DEBUG] Re-mapping token_to_approve address for compatibility.")
-        token_to_approve = "0x2f2a2543B76A4166549F7aaB2e75Bef0aefC5B0f"
-
     # Convert addresses to checksum format
-    print("[DEBUG] Converting spender address to checksum format.")
+    logger.debug("Converting spender address to checksum format.")
     spender_checksum_address = convert_to_checksum_address(config, spender)
 
-    print("[DEBUG] Converting user wallet address to checksum format.")
+    logger.debug("Converting user wallet address to checksum format.")
     user_checksum_address = convert_to_checksum_address(config, config.user_wallet_address)
 
-    print("[DEBUG] Converting token address to checksum format.")
+    logger.debug("Converting token address to checksum format.")
     token_checksum_address = convert_to_checksum_address(config, token_to_approve)
 
+    # Handle specific cases for known token mappings
+    if token_checksum_address == BTC_INDEX_TOKEN_ADDRESS:
+        logger.debug("Re-mapping token_to_approve address for compatibility.")
+        token_checksum_address = WBTC_ADDRESS
+
+    # Skip the balance and allowance reads if we know enough is already approved
+    allowance_cache_key = (user_checksum_address, token_checksum_address, spender_checksum_address)
+    cached_allowance = _ALLOWANCE_CACHE.get(allowance_cache_key)
+    if cached_allowance is not None and cached_allowance >= amount_of_tokens_to_spend:
+        logger.debug("Cached allowance %s (raw units) covers spend.", cached_allowance)
+        _ALLOWANCE_CACHE[allowance_cache_key] = cached_allowance - amount_of_tokens_to_spend
+        return
+
     # Load the token contract ABI for interaction
-    print("[DEBUG] Loading token contract ABI.")
-    token_contract_abi = json.load(open(os.path.join(
+    logger.debug("Loading token contract ABI.")
+    token_contract_abi = load_abi(os.path.join(
         base_dir,
         'gmx_python_sdk',
         'contracts',
         'token_approval.json'
-    )))
+    ))
 
     # Create a contract object for interacting with the token
     token_contract_obj = connection.eth.contract(
-        address=token_to_approve,
+        address=token_checksum_address,
         abi=token_contract_abi
     )
 
-    # Determine balance for native tokens (ETH) or ERC-20 tokens
-    print("[DEBUG] Fetching wallet balance.")
-    if token_checksum_address == "0x82aF49447D8a07e3bd95BD0d56f35241523fBab1":  # ETH on Arbitrum
-        try:
-            balance_of = connection.eth.getBalance(user_checksum_address)
-        except AttributeError:
-            balance_of = connection.eth.get_balance(user_checksum_address)
+    # Determine balance for native tokens (ETH) or ERC-20 tokens, batching the
+    # balance and allowance reads into a single Multicall3 round trip
+    logger.debug("Fetching wallet balance and current allowance for spender.")
+    if token_checksum_address == WETH_ARBITRUM_ADDRESS:
+        balance_call = get_multicall3_contract(config).functions.getEthBalance(
+            user_checksum_address
+        )
     else:  # ERC-20 tokens
-        balance_of = token_contract_obj.functions.balanceOf(user_checksum_address).call()
+        balance_call = token_contract_obj.functions.balanceOf(user_checksum_address)
 
-    print(f"[DEBUG] Wallet balance: {balance_of} (raw units).")
+    allowance_call = token_contract_obj.functions.allowance(
+        user_checksum_address,
+        spender_checksum_address
+    )
+
+    balance_of, amount_approved = multicall3_aggregate(
+        config,
+        [balance_call, allowance_call]
+    )
+
+    logger.debug("Wallet balance: %s (raw units).", balance_of)
 
     # Check if balance is sufficient for the transaction
     if balance_of < amount_of_tokens_to_spend:
-        print("[ERROR] Insufficient balance to proceed with the transaction.")
+        logger.error("Insufficient balance to proceed with the transaction.")
         raise Exception("Insufficient balance!")
 
-    # Check current allowance for the spender
-    print("[DEBUG] Fetching current allowance for spender.")
-    amount_approved = token_contract_obj.functions.allowance(
-        user_checksum_address,
-        spender_checksum_address
-    ).call()
-
-    print(f"[DEBUG] Current allowance: {amount_approved} (raw units).")
+    logger.debug("Current allowance: %s (raw units).", amount_approved)
 
     # If insufficient allowance and approval is enabled, approve the spender
     if amount_approved < amount_of_tokens_to_spend and approve:
-        print("[DEBUG] Allowance insufficient. Proceeding to approve spender.")
-
-        print('Approving contract "{}" to spend {} tokens belonging to token address: {}'.format(
-            spender_checksum_address, amount_of_tokens_to_spend, token_checksum_address))
-
-        # Fetch the current nonce for the user's wallet
-        nonce = connection.eth.get_transaction_count(user_checksum_address)
-
-        # Build the approval transaction
-        arguments = (spender_checksum_address, amount_of_tokens_to_spend)
-        raw_txn = token_contract_obj.functions.approve(
-            *arguments
-        ).build_transaction({
-            'value': 0,
-            'chainId': config.chain_id,
-            'gas': 4000000,
-            'maxFeePerGas': int(max_fee_per_gas),
-            'maxPriorityFeePerGas': 0,
-            'nonce': nonce
-        })
-
-        # Sign the transaction with the user's private key
-        signed_txn = connection.eth.account.sign_transaction(
-            raw_txn,
-            config.private_key
-        )
+        logger.debug("Allowance insufficient. Proceeding to approve spender.")
 
-        # Submit the transaction to the blockchain
-        try:
-            txn = signed_txn.rawTransaction
-        except TypeError:
-            txn = signed_txn.raw_transaction
+        logger.info(
+            'Approving contract "%s" to spend %s tokens belonging to token address: %s',
+            spender_checksum_address, amount_of_tokens_to_spend, token_checksum_address
+        )
 
-        tx_hash = connection.eth.send_raw_transaction(txn)
+        # Take the next nonce for the user's wallet, shared with order submission
+        nonce, = nonce_manager.next(connection, user_checksum_address)
 
-        print("Txn submitted!")
-        print("Check status: https://arbiscan.io/tx/{}".format(tx_hash.hex()))
+        try:
+            # Build the approval transaction
+            raw_txn = _build_approve_transaction(
+                config,
+                token_checksum_address,
+                spender_checksum_address,
+                amount_of_tokens_to_spend,
+                max_fee_per_gas=max_fee_per_gas,
+                max_priority_fee_per_gas=get_max_priority_fee(connection),
+                nonce=nonce
+            )
+
+            # Sign with the user's private key and submit the transaction to the blockchain
+            tx_hash = sign_and_send_transaction(config, connection, raw_txn)
+        except Exception:
+            # The reserved nonce was not used, resync with the node next time
+            nonce_manager.reset(connection, user_checksum_address)
+            raise
+
+        logger.info("Txn submitted!")
+        logger.info("Check status: https://arbiscan.io/tx/%s", tx_hash.hex())
+
+        amount_approved = amount_of_tokens_to_spend
 
     # If allowance is insufficient and approve is False, raise an error
     if amount_approved < amount_of_tokens_to_spend and not approve:
-        print("[ERROR] Token not approved for spend. Please allow first!")
+        logger.error("Token not approved for spend. Please allow first!")
         raise Exception("Token not approved for spend, please allow first!")
 
+    _ALLOWANCE_CACHE[allowance_cache_key] = amount_approved - amount_of_tokens_to_spend
+
     # Log success message
-    print('Contract "{}" approved to spend {} tokens belonging to token address: {}'.format(
-        spender_checksum_address, amount_of_tokens_to_spend, token_checksum_address))
-    print("Coins Approved for spend!")
+    logger.info(
+        'Contract "%s" approved to spend %s tokens belonging to token address: %s',
+        spender_checksum_address, amount_of_tokens_to_spend, token_checksum_address
+    )
+    logger.info("Coins Approved for spend!")
 
 
 if __name__ == "__main__":
@@ -5,7 +5,95 @@ from .keys import (
     withdraw_gas_limit_key
 )
 
-from .gmx_utils import apply_factor, get_datastore_contract, create_connection
+from .gmx_utils import apply_factor, get_datastore_contract, create_connection, TTLCache
+
+# Seconds that gas limits read from the datastore are reused for
+GAS_LIMITS_CACHE_TTL = 30
+
+
+_gas_limits_cache = TTLCache(GAS_LIMITS_CACHE_TTL)
+_gas_limit_values_cache = TTLCache(GAS_LIMITS_CACHE_TTL)
+
+# Seconds that the priority fee suggested by the node is reused for
+PRIORITY_FEE_CACHE_TTL = 30
+_priority_fee_cache = TTLCache(PRIORITY_FEE_CACHE_TTL)
+
+
+def get_max_priority_fee(connection):
+    """
+    Get the priority fee per gas suggested by the node, reusing the result for
+    PRIORITY_FEE_CACHE_TTL seconds. Falls back to 0 if the node does not
+    support eth_maxPriorityFeePerGas.
+
+    Parameters
+    ----------
+    connection : web3_obj
+        web3 connection.
+
+    """
+    cache_key = connection.provider.endpoint_uri
+    max_priority_fee = _priority_fee_cache.get(cache_key)
+
+    if max_priority_fee is None:
+        try:
+            max_priority_fee = connection.eth.max_priority_fee
+        except ValueError:
+            max_priority_fee = 0
+        _priority_fee_cache.set(cache_key, max_priority_fee)
+
+    return max_priority_fee
+
+
+def _gas_limit_cache_key(gas_limit):
+    return gas_limit.address, gas_limit._encode_transaction_data()
+
+
+def get_cached_gas_limit(gas_limit):
+    """
+    Return the cached result of an uncalled datastore gas limit object, or None
+    if it has not been called within the last GAS_LIMITS_CACHE_TTL seconds
+
+    Parameters
+    ----------
+    gas_limit : datastore_object
+        uncalled datastore gas limit object.
+
+    """
+    return _gas_limit_values_cache.get(_gas_limit_cache_key(gas_limit))
+
+
+def set_cached_gas_limit(gas_limit, value: int):
+    """
+    Store the result of calling an uncalled datastore gas limit object
+
+    Parameters
+    ----------
+    gas_limit : datastore_object
+        uncalled datastore gas limit object.
+    value : int
+        result of gas_limit.call().
+
+    """
+    _gas_limit_values_cache.set(_gas_limit_cache_key(gas_limit), value)
+
+
+def call_gas_limit(gas_limit):
+    """
+    Call an uncalled datastore gas limit object, reusing the result for
+    GAS_LIMITS_CACHE_TTL seconds
+
+    Parameters
+    ----------
+    gas_limit : datastore_object
+        uncalled datastore gas limit object.
+
+    """
+    value = get_cached_gas_limit(gas_limit)
+    if value is None:
+        value = gas_limit.call()
+        set_cached_gas_limit(gas_limit, value)
+
+    return value
 
 
 def get_execution_fee(gas_limits: dict, estimated_gas_limit, gas_price: int):
@@ -24,9 +112,9 @@ def get_execution_fee(gas_limits: dict, estimated_gas_limit, gas_price: int):
 
     """
 
-    base_gas_limit = gas_limits['estimated_fee_base_gas_limit'].call()
-    multiplier_factor = gas_limits['estimated_fee_multiplier_factor'].call()
-    adjusted_gas_limit = base_gas_limit + apply_factor(estimated_gas_limit.call(),
+    base_gas_limit = call_gas_limit(gas_limits['estimated_fee_base_gas_limit'])
+    multiplier_factor = call_gas_limit(gas_limits['estimated_fee_multiplier_factor'])
+    adjusted_gas_limit = base_gas_limit + apply_factor(call_gas_limit(estimated_gas_limit),
                                                        multiplier_factor)
 
     return adjusted_gas_limit * gas_price
@@ -36,6 +124,7 @@ def get_gas_limits(datastore_object):
     """
     Given a Web3 contract object of the datstore, return a dictionary with the uncalled gas limits
     that correspond to various operations that will require the execution fee to calculated for.
+    The dictionary is shared per datastore for GAS_LIMITS_CACHE_TTL seconds.
 
     Parameters
     ----------
@@ -43,6 +132,10 @@ def get_gas_limits(datastore_object):
         contract connection.
 
     """
+    gas_limits = _gas_limits_cache.get(datastore_object.address)
+    if gas_limits is not None:
+        return gas_limits
+
     gas_limits = {
         "deposit": datastore_object.functions.getUint(deposit_gas_limit_key()),
         "withdraw": datastore_object.functions.getUint(withdraw_gas_limit_key()),
@@ -55,6 +148,8 @@ def get_gas_limits(datastore_object):
         "estimated_fee_multiplier_factor": datastore_object.functions.getUint(
             execution_gas_fee_multiplier_key())}
 
+    _gas_limits_cache.set(datastore_object.address, gas_limits)
+
     return gas_limits
 
 
@@ -1,18 +1,30 @@
 import logging
 
+from concurrent.futures import ThreadPoolExecutor
+
 from ..gmx_utils import (
-    contract_map, get_tokens_address_dict, get_reader_contract
+    contract_map, get_tokens_address_dict, get_reader_contract, TTLCache
 )
 
 from .get_oracle_prices import OraclePrices
 
+# Seconds processed market info is shared between Markets objects for the
+# same chain and rpc
+MARKETS_INFO_CACHE_TTL = 300
+_markets_info_cache = TTLCache(MARKETS_INFO_CACHE_TTL)
+
 
 class Markets:
     def __init__(self, config):
         self.config = config
-        self.info = self._process_markets()
         self.log = logging.getLogger(__name__)
 
+        self._cache_key = (config.chain, config.rpc)
+        self.info = _markets_info_cache.get(self._cache_key)
+        if self.info is None:
+            self.info = self._process_markets()
+            _markets_info_cache.set(self._cache_key, self.info)
+
     def get_index_token_address(self, market_key: str) -> str:
         return self.info[market_key]['index_token_address']
 
@@ -49,7 +61,10 @@ class Markets:
 
         """
         logging.info("Getting Available Markets..")
-        return self._process_markets()
+        markets = self._process_markets()
+        _markets_info_cache.set(self._cache_key, markets)
+
+        return markets
 
     def _get_available_markets_raw(self):
         """
@@ -83,15 +98,29 @@ class Markets:
             dictionary decoded market data.
 
         """
-        token_address_dict = get_tokens_address_dict(self.config.chain)
-        raw_markets = self._get_available_markets_raw()
+        # The token list, markets and signed prices are independent requests,
+        # so fetch them concurrently
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            token_address_dict_future = executor.submit(
+                get_tokens_address_dict, self.config.chain
+            )
+            raw_markets_future = executor.submit(
+                self._get_available_markets_raw
+            )
+            prices_future = executor.submit(
+                OraclePrices(chain=self.config.chain).get_recent_prices
+            )
+
+            token_address_dict = token_address_dict_future.result()
+            raw_markets = raw_markets_future.result()
+            prices = prices_future.result()
 
         decoded_markets = {}
         for raw_market in raw_markets:
             try:
 
                 if not self._check_if_index_token_in_signed_prices_api(
-                    raw_market[1]
+                    raw_market[1], prices
                 ):
                     continue
                 market_symbol = token_address_dict[raw_market[1]]['symbol']
@@ -117,7 +146,7 @@ class Markets:
             # swap market
             except KeyError:
                 if not self._check_if_index_token_in_signed_prices_api(
-                    raw_market[1]
+                    raw_market[1], prices
                 ):
                     continue
 
@@ -140,10 +169,13 @@ class Markets:
 
         return decoded_markets
 
-    def _check_if_index_token_in_signed_prices_api(self, index_token_address):
+    def _check_if_index_token_in_signed_prices_api(
+        self, index_token_address, prices: dict = None
+    ):
 
         try:
-            prices = OraclePrices(chain=self.config.chain).get_recent_prices()
+            if prices is None:
+                prices = OraclePrices(chain=self.config.chain).get_recent_prices()
 
             if index_token_address == "0x0000000000000000000000000000000000000000":
                 return True
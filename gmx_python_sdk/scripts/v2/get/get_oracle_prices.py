@@ -1,4 +1,9 @@
-import requests
+from ..gmx_utils import http_session, TTLCache
+
+# Seconds that signed prices are reused for, roughly one Arbitrum block, so
+# that lookups made while building a single order share one request
+ORACLE_PRICES_CACHE_TTL = 0.25
+_oracle_prices_cache = TTLCache(ORACLE_PRICES_CACHE_TTL)
 
 
 class OraclePrices:
@@ -23,8 +28,15 @@ class OraclePrices:
             dictionary containing raw output for each token as its keys.
 
         """
+        prices = _oracle_prices_cache.get(self.chain)
+        if prices is not None:
+            return prices
+
         raw_output = self._make_query().json()
-        return self._process_output(raw_output)
+        prices = self._process_output(raw_output)
+        _oracle_prices_cache.set(self.chain, prices)
+
+        return prices
 
     def _make_query(self):
         """
@@ -37,7 +49,7 @@ class OraclePrices:
 
         """
         url = self.oracle_url[self.chain]
-        return requests.get(url)
+        return http_session.get(url)
 
     def _process_output(self, output: dict):
         """
@@ -1,17 +1,41 @@
-from eth_abi import encode
-from web3 import Web3
+from eth_abi import encode, decode
+from eth_account.datastructures import SignedTransaction
+from eth_utils.abi import collapse_if_tuple
+from hexbytes import HexBytes
+from web3 import Web3, HTTPProvider
+import asyncio
+import functools
 import yaml
 import logging
+import math
 import os
 import json
+import tempfile
+import time
+import threading
 import requests
 
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import numpy as np
 import pandas as pd
 
 from datetime import datetime
+from typing import NamedTuple
 
 from concurrent.futures import ThreadPoolExecutor
 
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 # Get the absolute path of the current script
 current_script_path = os.path.abspath(__file__)
@@ -20,6 +44,22 @@ base_dir = os.path.abspath(
 )
 package_dir = base_dir + '/gmx_python_sdk/'
 
+# Shared session so repeated api requests reuse TCP/TLS connections
+http_session = requests.Session()
+http_session.mount(
+    'https://',
+    HTTPAdapter(pool_connections=4, pool_maxsize=16)
+)
+
+# Web3 connections keyed by rpc url, see create_connection
+_W3_CACHE = {}
+
+# Seconds the GMX token list is reused before being fetched again
+TOKENS_CACHE_MAX_AGE = 3600
+_tokens_address_dict_cache = {}
+_token_index_cache = {}
+_symbol_to_address_cache = {}
+
 logging.basicConfig(
     format='{asctime} {levelname}: {message}',
     datefmt='%m/%d/%Y %I:%M:%S %p',
@@ -28,15 +68,212 @@ logging.basicConfig(
 )
 
 
+class TTLCache:
+    """
+    Minimal cache where each entry expires ttl seconds after it was set
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries = {}
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            self._entries.pop(key, None)
+            return None
+
+        return value
+
+    def set(self, key, value):
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+
+    def clear(self):
+        self._entries.clear()
+
+
+def read_json_file(filepath: str):
+    """
+    Read a json file, using orjson if it is installed
+
+    Parameters
+    ----------
+    filepath : str
+        path to json file.
+
+    """
+    if orjson is not None:
+        with open(filepath, 'rb') as f:
+            return orjson.loads(f.read())
+
+    with open(filepath) as f:
+        return json.load(f)
+
+
+def _contains_non_finite_float(data):
+    """
+    Check if data contains a NaN or infinite float anywhere in its nested
+    dicts and lists
+    """
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return False
+
+
+def write_json_file(filepath: str, data):
+    """
+    Write data to a json file, using orjson if it is installed. Data holding
+    NaN or infinite floats is always written with json, which keeps them as
+    NaN and Infinity where orjson would write null.
+
+    Parameters
+    ----------
+    filepath : str
+        path to json file.
+    data : dict or list
+        data to serialise.
+
+    """
+    if orjson is not None and not _contains_non_finite_float(data):
+        try:
+            serialised = orjson.dumps(data)
+        except TypeError:
+            # orjson only supports 64 bit integers, fall back for larger values
+            serialised = None
+
+        if serialised is not None:
+            with open(filepath, 'wb') as f:
+                f.write(serialised)
+            return
+
+    with open(filepath, 'w') as f:
+        json.dump(data, f)
+
+
 # Functions required for multithreading
 def execute_call(call):
     return call.call()
 
 
+async def _async_rpc_request(session, rpc_url: str, method: str, params: list):
+    """
+    Post a raw JSON-RPC request and return its result
+    """
+    payload = {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": method,
+        "params": params
+    }
+    async with session.post(rpc_url, json=payload) as response:
+        response.raise_for_status()
+        output = await response.json(content_type=None)
+
+    if 'error' in output:
+        raise ValueError(output['error'])
+
+    return output['result']
+
+
+async def _async_eth_call(session, rpc_url: str, to: str, data: str, block='latest'):
+    """
+    Post a raw eth_call JSON-RPC request and return the hex encoded result
+    """
+    return await _async_rpc_request(
+        session, rpc_url, "eth_call", [{"to": to, "data": data}, block]
+    )
+
+
+async def _async_execute_calls(rpc_url: str, encoded_calls: list):
+    connector = aiohttp.TCPConnector(limit=64)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        return await asyncio.gather(
+            *[
+                _async_eth_call(session, rpc_url, to, data)
+                for to, data in encoded_calls
+            ]
+        )
+
+
+def _get_http_rpc_url(function_calls):
+    """
+    Return the rpc url shared by a list of uncalled contract functions, or None
+    if they are not all bound to the same HTTP provider
+    """
+    rpc_urls = set()
+    for call in function_calls:
+        provider = call.w3.provider
+        if not isinstance(provider, HTTPProvider):
+            return None
+        rpc_urls.add(provider.endpoint_uri)
+
+    if len(rpc_urls) != 1:
+        return None
+    return rpc_urls.pop()
+
+
 def execute_threading(function_calls):
+    """
+    Execute a list of uncalled contract functions concurrently. If aiohttp is
+    installed the eth_calls are sent in parallel over a single async session,
+    otherwise each call is made from a thread pool.
+
+    Parameters
+    ----------
+    function_calls : list
+        list of uncalled web3 contract functions.
+
+    Returns
+    -------
+    list
+        decoded output of each call, in the order they were passed.
+
+    """
+    rpc_url = None
+    if aiohttp is not None and function_calls:
+        rpc_url = _get_http_rpc_url(function_calls)
+
+    # asyncio.run cannot be used from inside an already running event loop
+    try:
+        asyncio.get_running_loop()
+        rpc_url = None
+    except RuntimeError:
+        pass
+
+    if rpc_url is not None:
+        encoded_calls = [
+            (call.address, call._encode_transaction_data())
+            for call in function_calls
+        ]
+        raw_outputs = asyncio.run(_async_execute_calls(rpc_url, encoded_calls))
+        try:
+            return [
+                decode_call_output(call, bytes.fromhex(raw_output[2:]))
+                for call, raw_output in zip(function_calls, raw_outputs)
+            ]
+        except ImportError:
+            logging.warning(
+                "Installed web3 can not decode raw call output, calling through web3 instead"
+            )
+
+    return _execute_calls_in_threads(function_calls)
+
+
+def _execute_calls_in_threads(function_calls):
     with ThreadPoolExecutor() as executor:
-        results = list(executor.map(execute_call, function_calls))
-    return results
+        return list(executor.map(execute_call, function_calls))
 
 
 contract_map = {
@@ -86,6 +323,11 @@ contract_map = {
         {
             "contract_address": "0xd4f522c4339Ae0A90a156bd716715547e44Bed65",
             "abi_path": "contracts/arbitrum/glvreader.json"
+        },
+        "multicall3":
+        {
+            "contract_address": "0xcA11bde05977b3631167028862bE2a173976CA11",
+            "abi_path": "contracts/multicall3.json"
         }
     },
     'avalanche':
@@ -129,11 +371,42 @@ contract_map = {
         {
             "contract_address": "0x820F5FfC5b525cD4d88Cd91aCf2c28F16530Cc68",
             "abi_path": "contracts/avalanche/syntheticsrouter.json"
+        },
+        "multicall3":
+        {
+            "contract_address": "0xcA11bde05977b3631167028862bE2a173976CA11",
+            "abi_path": "contracts/multicall3.json"
         }
     }
 }
 
 
+# Parsed config files keyed by path, reused until the file is modified
+_CONFIG_FILE_CACHE = {}
+
+# libyaml's C loader is much faster than the pure python one when available
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+def _load_config_file(filepath: str):
+    """
+    Load a yaml config file, reusing the parsed contents while its
+    modification time is unchanged
+    """
+    mtime = os.stat(filepath).st_mtime
+    cached = _CONFIG_FILE_CACHE.get(filepath)
+
+    if cached is not None and cached['mtime'] == mtime:
+        return cached['data']
+
+    with open(filepath, 'r') as file:
+        config_file = yaml.load(file, Loader=_YAML_LOADER)
+
+    _CONFIG_FILE_CACHE[filepath] = {'mtime': mtime, 'data': config_file}
+
+    return config_file
+
+
 class ConfigManager:
 
     def __init__(self, chain: str):
@@ -147,8 +420,7 @@ class ConfigManager:
 
     def set_config(self, filepath: str = os.path.join(base_dir, "config.yaml")):
 
-        with open(filepath, 'r') as file:
-            config_file = yaml.safe_load(file)
+        config_file = _load_config_file(filepath)
 
         self.set_rpc(config_file['rpcs'][self.chain])
         self.set_chain_id(config_file['chain_ids'][self.chain])
@@ -170,14 +442,59 @@ class ConfigManager:
 
 def create_connection(config):
     """
-    Create a connection to the blockchain
+    Create a connection to the blockchain. Connections are cached per rpc url
+    and share a keep-alive session, so repeated calls reuse the same TCP/TLS
+    connection rather than opening a new one per request.
     """
-
-    web3_obj = Web3(Web3.HTTPProvider(config.rpc))
+    web3_obj = _W3_CACHE.get(config.rpc)
+
+    if web3_obj is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_maxsize=32,
+            # JSON-RPC is all POST, so every method is retryable. Reads are
+            # never retried, a request that timed out waiting for its
+            # response may already have reached the node, and resending
+            # eth_sendRawTransaction would then fail as already known.
+            max_retries=Retry(
+                total=3,
+                read=0,
+                backoff_factor=0.1,
+                status_forcelist=[502, 503, 504],
+                allowed_methods=None
+            )
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+
+        web3_obj = Web3(
+            Web3.HTTPProvider(
+                config.rpc,
+                request_kwargs={'timeout': 30},
+                session=session
+            )
+        )
+        _W3_CACHE[config.rpc] = web3_obj
 
     return web3_obj
 
 
+# Names which differ between web3.py / eth-account versions, resolved once at
+# import rather than by catching errors on every call
+to_checksum_address = getattr(
+    Web3, 'to_checksum_address', getattr(Web3, 'toChecksumAddress', None)
+)
+RAW_TRANSACTION_ATTR = (
+    'raw_transaction' if hasattr(SignedTransaction, 'raw_transaction')
+    else 'rawTransaction'
+)
+
+
+@functools.lru_cache(maxsize=1024)
+def _to_checksum_address(address: str):
+    return to_checksum_address(address)
+
+
 def convert_to_checksum_address(config, address: str):
     """
     Convert a given address to checksum format
@@ -195,19 +512,46 @@ def convert_to_checksum_address(config, address: str):
         checksum formatted address.
 
     """
-    web3_obj = create_connection(config)
+    return _to_checksum_address(address)
 
-    # Added to support older versions of web3.py for now
-    try:
-        return web3_obj.toChecksumAddress(address)
-    except AttributeError:
-        return web3_obj.to_checksum_address(address)
+
+@functools.lru_cache(maxsize=None)
+def load_abi(abi_path: str):
+    """
+    Load and cache a contract abi from a json file. The returned list is
+    shared between callers and should not be modified.
+
+    Parameters
+    ----------
+    abi_path : str
+        full path to the abi json file.
+
+    """
+    return read_json_file(abi_path)
+
+
+@functools.lru_cache(maxsize=128)
+def _get_contract_object(web3_obj, contract_name: str, chain: str):
+    contract_address = contract_map[chain][contract_name]["contract_address"]
+
+    contract_abi = load_abi(
+        os.path.join(
+            base_dir,
+            'gmx_python_sdk',
+            contract_map[chain][contract_name]["abi_path"]
+        )
+    )
+    return web3_obj.eth.contract(
+        address=contract_address,
+        abi=contract_abi
+    )
 
 
 def get_contract_object(web3_obj, contract_name: str, chain: str):
     """
     Using a contract name, retrieve the address and api from contract map
-    and create a web3 contract object
+    and create a web3 contract object. Contract objects are cached per web3
+    connection.
 
     Parameters
     ----------
@@ -224,21 +568,7 @@ def get_contract_object(web3_obj, contract_name: str, chain: str):
         an instantied web3 contract object.
 
     """
-    contract_address = contract_map[chain][contract_name]["contract_address"]
-
-    contract_abi = json.load(
-        open(
-            os.path.join(
-                base_dir,
-                'gmx_python_sdk',
-                contract_map[chain][contract_name]["abi_path"]
-            )
-        )
-    )
-    return web3_obj.eth.contract(
-        address=contract_address,
-        abi=contract_abi
-    )
+    return _get_contract_object(web3_obj, contract_name, chain)
 
 
 def get_token_balance_contract(config: str, contract_address: str):
@@ -255,13 +585,11 @@ def get_token_balance_contract(config: str, contract_address: str):
     """
 
     web3_obj = create_connection(config)
-    contract_abi = json.load(
-        open(
-            os.path.join(
-                package_dir,
-                'contracts',
-                'balance_abi.json'
-            )
+    contract_abi = load_abi(
+        os.path.join(
+            package_dir,
+            'contracts',
+            'balance_abi.json'
         )
     )
     return web3_obj.eth.contract(
@@ -270,47 +598,201 @@ def get_token_balance_contract(config: str, contract_address: str):
     )
 
 
-def get_tokens_address_dict(chain: str):
+def _fetch_token_infos(chain: str):
     """
-    Query the GMX infra api for to generate dictionary of tokens available on v2
+    Query the GMX infra api for the list of tokens available on v2
 
     Parameters
     ----------
     chain : str
         avalanche of arbitrum.
 
-    Returns
-    -------
-    token_address_dict : dict
-        dictionary containing available tokens to trade on GMX.
-
     """
     url = {
         "arbitrum": "https://arbitrum-api.gmxinfra.io/tokens",
         "avalanche": "https://avalanche-api.gmxinfra.io/tokens"
     }
 
+    response = http_session.get(url[chain], timeout=5)
+    response.raise_for_status()
+
+    return response.json()['tokens']
+
+
+def _load_token_infos(chain: str):
+    """
+    Load the token list from the datastore cache file if it is fresh, otherwise
+    fetch it from the api and rewrite the cache file. If the api can not be
+    reached a stale cache file is used instead.
+
+    Parameters
+    ----------
+    chain : str
+        avalanche of arbitrum.
+
+    """
+    filepath = os.path.join(
+        package_dir,
+        'data_store',
+        'tokens_{}.json'.format(chain)
+    )
+
     try:
-        response = requests.get(url[chain])
+        cache_age = time.time() - os.path.getmtime(filepath)
+    except OSError:
+        cache_age = None
 
-        # Check if the request was successful (status code 200)
-        if response.status_code == 200:
+    if cache_age is not None and cache_age < TOKENS_CACHE_MAX_AGE:
+        return read_json_file(filepath)
 
-            # Parse the JSON response
-            token_infos = response.json()['tokens']
-        else:
-            print(f"Error: {response.status_code}")
+    try:
+        token_infos = _fetch_token_infos(chain)
     except requests.RequestException as e:
-        print(f"Error: {e}")
+        if cache_age is None:
+            raise
+        logging.warning(
+            "Failed to fetch token list, using cached copy: {}".format(e)
+        )
+        return read_json_file(filepath)
+
+    # Write to a unique temporary file first so readers never see a partial
+    # file and concurrent refreshes do not collide. Failing to write the cache
+    # should not fail a successful fetch.
+    tmp_filepath = None
+    try:
+        fd, tmp_filepath = tempfile.mkstemp(
+            dir=os.path.dirname(filepath),
+            prefix='tokens_{}.'.format(chain),
+            suffix='.tmp.json'
+        )
+        os.close(fd)
+        write_json_file(tmp_filepath, token_infos)
+        os.replace(tmp_filepath, filepath)
+    except OSError as e:
+        logging.warning("Failed to write token list cache: {}".format(e))
+        if tmp_filepath is not None:
+            try:
+                os.remove(tmp_filepath)
+            except OSError:
+                pass
+
+    return token_infos
+
+
+def get_tokens_address_dict(chain: str):
+    """
+    Query the GMX infra api for to generate dictionary of tokens available on v2.
+    The token list is cached in memory and on disk for TOKENS_CACHE_MAX_AGE
+    seconds.
+
+    Parameters
+    ----------
+    chain : str
+        avalanche of arbitrum.
+
+    Returns
+    -------
+    token_address_dict : dict
+        dictionary containing available tokens to trade on GMX.
+
+    """
+    cached = _tokens_address_dict_cache.get(chain)
+    if cached is not None and time.time() - cached[0] < TOKENS_CACHE_MAX_AGE:
+        return cached[1]
+
+    token_infos = _load_token_infos(chain)
 
     token_address_dict = {}
 
     for token_info in token_infos:
         token_address_dict[token_info['address']] = token_info
 
+    _tokens_address_dict_cache[chain] = (time.time(), token_address_dict)
+
     return token_address_dict
 
 
+class TokenIndex(NamedTuple):
+    """
+    Token list split into parallel arrays, with a lookup from address to
+    position, so per token fields can be gathered for many tokens at once
+    """
+    by_address: dict
+    positions: dict
+    addresses: list
+    decimals: np.ndarray
+    symbols: list
+
+    def get_decimals(self, token_addresses: list):
+        """
+        Return an array of decimals aligned with token_addresses
+        """
+        return self.decimals[
+            [self.positions[address] for address in token_addresses]
+        ]
+
+
+def get_token_index(chain: str):
+    """
+    Build a TokenIndex for the tokens available on v2. The index is rebuilt
+    whenever get_tokens_address_dict refreshes the token list.
+
+    Parameters
+    ----------
+    chain : str
+        avalanche of arbitrum.
+
+    """
+    token_address_dict = get_tokens_address_dict(chain)
+
+    cached = _token_index_cache.get(chain)
+    if cached is not None and cached[0] is token_address_dict:
+        return cached[1]
+
+    addresses = list(token_address_dict)
+    token_index = TokenIndex(
+        by_address=token_address_dict,
+        positions={address: i for i, address in enumerate(addresses)},
+        addresses=addresses,
+        decimals=np.fromiter(
+            (token_address_dict[address]['decimals'] for address in addresses),
+            dtype=np.int64,
+            count=len(addresses)
+        ),
+        symbols=[token_address_dict[address]['symbol'] for address in addresses]
+    )
+    _token_index_cache[chain] = (token_address_dict, token_index)
+
+    return token_index
+
+
+def get_symbol_to_address(chain: str):
+    """
+    Get a dictionary mapping token symbol to address for the tokens available
+    on v2. Where two tokens share a symbol the first listed is kept. The
+    mapping is rebuilt whenever get_tokens_address_dict refreshes the token
+    list.
+
+    Parameters
+    ----------
+    chain : str
+        avalanche of arbitrum.
+
+    """
+    token_address_dict = get_tokens_address_dict(chain)
+
+    cached = _symbol_to_address_cache.get(chain)
+    if cached is not None and cached[0] is token_address_dict:
+        return cached[1]
+
+    symbol_to_address = {}
+    for address, token_info in token_address_dict.items():
+        symbol_to_address.setdefault(token_info.get('symbol'), address)
+    _symbol_to_address_cache[chain] = (token_address_dict, symbol_to_address)
+
+    return symbol_to_address
+
+
 def get_reader_contract(config):
     """
     Get a reader contract web3_obj for a given chain
@@ -406,6 +888,94 @@ def get_glv_reader_contract(config):
     )
 
 
+def get_multicall3_contract(config):
+    """
+    Get a Multicall3 contract web3_obj for a given chain
+
+    Parameters
+    ----------
+    chain : str
+        avalanche or arbitrum.
+
+    """
+
+    web3_obj = create_connection(config)
+    return get_contract_object(
+        web3_obj,
+        'multicall3',
+        config.chain
+    )
+
+
+def decode_call_output(call, return_data: bytes):
+    """
+    Decode the raw bytes returned by an eth_call using the output types of
+    the uncalled contract function, matching what call.call() would return
+
+    Parameters
+    ----------
+    call : web3 contract function
+        the uncalled contract function that produced return_data.
+    return_data : bytes
+        raw return data.
+
+    """
+    # web3's return normalizers are private, so they are imported here rather
+    # than at module level. If web3 moves them only the callers that decode
+    # raw output fall back, importing the SDK still works.
+    from web3._utils.abi import map_abi_data
+    from web3._utils.normalizers import BASE_RETURN_NORMALIZERS
+
+    output_types = [collapse_if_tuple(output) for output in call.abi['outputs']]
+    output = map_abi_data(
+        BASE_RETURN_NORMALIZERS,
+        output_types,
+        decode(output_types, return_data)
+    )
+
+    if len(output) == 1:
+        return output[0]
+    return list(output)
+
+
+def multicall3_aggregate(config, calls: list):
+    """
+    Execute a list of contract reads in a single eth_call using Multicall3's
+    aggregate3, rather than one round trip per call
+
+    Parameters
+    ----------
+    config : object
+        Configuration object containing chain details.
+    calls : list
+        list of uncalled web3 contract functions.
+
+    Returns
+    -------
+    list
+        decoded output of each call, in the order they were passed.
+
+    """
+    multicall_contract_obj = get_multicall3_contract(config)
+
+    encoded_calls = [
+        (call.address, False, call._encode_transaction_data())
+        for call in calls
+    ]
+    results = multicall_contract_obj.functions.aggregate3(encoded_calls).call()
+
+    try:
+        return [
+            decode_call_output(call, return_data)
+            for call, (success, return_data) in zip(calls, results)
+        ]
+    except ImportError:
+        logging.warning(
+            "Installed web3 can not decode raw call output, calling through web3 instead"
+        )
+        return _execute_calls_in_threads(calls)
+
+
 def create_signer(config: str):
     """
     Creastea a signer for a given chain
@@ -424,6 +994,315 @@ def create_signer(config: str):
     return web3_obj.eth.account.from_key(private_key)
 
 
+def build_transaction_params(
+    config, value: int, gas: int, max_fee_per_gas: float,
+    max_priority_fee_per_gas: int, nonce: int
+):
+    """
+    Build the value, chain, gas, fee and nonce fields of an EIP-1559
+    transaction, shared by every transaction builder.
+
+    Parameters
+    ----------
+    config : object
+        Configuration object containing chain details.
+    value : int
+        amount of native token to send.
+    gas : int
+        gas limit of the transaction.
+    max_fee_per_gas : float
+        maximum fee per gas, truncated to an integer.
+    max_priority_fee_per_gas : int
+        priority fee per gas, capped at max_fee_per_gas.
+    nonce : int
+        nonce of the sending wallet.
+
+    """
+    max_fee_per_gas = int(max_fee_per_gas)
+
+    return {
+        'value': value,
+        'chainId': config.chain_id,
+        'gas': gas,
+        'maxFeePerGas': max_fee_per_gas,
+        'maxPriorityFeePerGas': min(int(max_priority_fee_per_gas), max_fee_per_gas),
+        'nonce': nonce
+    }
+
+
+def build_contract_transaction(
+    config, contract_function, value: int, gas: int, max_fee_per_gas: float,
+    max_priority_fee_per_gas: int, nonce: int
+):
+    """
+    Build an EIP-1559 transaction for a contract function. Passing gas
+    explicitly means web3 does not need to estimate it.
+
+    Parameters
+    ----------
+    config : object
+        Configuration object containing chain details.
+    contract_function : web3 contract function
+        contract function to call, with arguments applied.
+    value : int
+        amount of native token to send.
+    gas : int
+        gas limit of the transaction.
+    max_fee_per_gas : float
+        maximum fee per gas.
+    max_priority_fee_per_gas : int
+        priority fee per gas, capped at max_fee_per_gas.
+    nonce : int
+        nonce of the sending wallet.
+
+    """
+    return contract_function.build_transaction(
+        build_transaction_params(
+            config, value, gas, max_fee_per_gas, max_priority_fee_per_gas, nonce
+        )
+    )
+
+
+def sign_transaction(config, connection, raw_txn: dict):
+    """
+    Sign a built transaction with the configured private key
+
+    Parameters
+    ----------
+    config : object
+        Configuration object containing the private key.
+    connection : web3_obj
+        web3 connection.
+    raw_txn : dict
+        transaction built by build_contract_transaction.
+
+    Returns
+    -------
+    bytes
+        raw signed transaction.
+
+    """
+    signed_txn = connection.eth.account.sign_transaction(
+        raw_txn,
+        config.private_key
+    )
+
+    return getattr(signed_txn, RAW_TRANSACTION_ATTR)
+
+
+def sign_and_send_transaction(config, connection, raw_txn: dict):
+    """
+    Sign a built transaction with the configured private key and submit it
+
+    Parameters
+    ----------
+    config : object
+        Configuration object containing the private key.
+    connection : web3_obj
+        web3 connection.
+    raw_txn : dict
+        transaction built by build_contract_transaction.
+
+    Returns
+    -------
+    HexBytes
+        hash of the submitted transaction.
+
+    """
+    signed_txn = sign_transaction(config, connection, raw_txn)
+
+    try:
+        return connection.eth.send_raw_transaction(signed_txn)
+    except Exception as e:
+        if 'already known' not in str(e).lower():
+            raise
+
+        # The node already holds this exact transaction, it was submitted
+        return Web3.keccak(signed_txn)
+
+
+def is_nonce_conflict_error(error: Exception):
+    """
+    Check if a send_raw_transaction error means the nonce was already used,
+    for example by a transaction sent from outside this process
+    """
+    message = str(error).lower()
+    return (
+        'nonce too low' in message
+        or 'nonce is too low' in message
+        or 'replacement transaction underpriced' in message
+    )
+
+
+class NonceManager:
+    """
+    Hands out nonces per wallet. The pending transaction count is read from
+    the node the first time a wallet is seen, after which nonces are
+    incremented locally so several transactions can be built and sent without
+    waiting on each other. Call reset after a nonce error to resync with the
+    node.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._next_nonces = {}
+
+    def next(self, connection, wallet_address: str, count: int = 1):
+        """
+        Reserve count consecutive nonces for wallet_address and return them as
+        a list.
+
+        Parameters
+        ----------
+        connection : web3_obj
+            web3 connection.
+        wallet_address : str
+            checksum address of the sending wallet.
+        count : int, optional
+            number of nonces to reserve. The default is 1.
+
+        """
+        key = (connection.provider.endpoint_uri, wallet_address)
+
+        with self._lock:
+            nonce = self._next_nonces.get(key)
+            if nonce is None:
+                nonce = connection.eth.get_transaction_count(
+                    wallet_address, 'pending'
+                )
+            self._next_nonces[key] = nonce + count
+
+        return list(range(nonce, nonce + count))
+
+    def is_known(self, connection, wallet_address: str):
+        """
+        Check if a nonce is held locally for wallet_address, i.e. the next call
+        to next will not read it from the node.
+        """
+        with self._lock:
+            return (
+                (connection.provider.endpoint_uri, wallet_address)
+                in self._next_nonces
+            )
+
+    def prime(self, connection, wallet_address: str, pending_count: int):
+        """
+        Seed the local nonce for wallet_address with a pending transaction
+        count read elsewhere, for example in a JSON-RPC batch. A nonce already
+        held locally is kept.
+        """
+        with self._lock:
+            self._next_nonces.setdefault(
+                (connection.provider.endpoint_uri, wallet_address),
+                pending_count
+            )
+
+    def reset(self, connection, wallet_address: str):
+        """
+        Forget the local nonce for wallet_address, the next call to next will
+        read it from the node again.
+        """
+        with self._lock:
+            self._next_nonces.pop(
+                (connection.provider.endpoint_uri, wallet_address), None
+            )
+
+
+# Shared between all orders so back to back submissions from one wallet do
+# not reuse a nonce
+nonce_manager = NonceManager()
+
+
+def sign_transactions(config, connection, raw_txns: list):
+    """
+    Sign a list of built transactions with the configured private key, using a
+    thread pool
+
+    Parameters
+    ----------
+    config : object
+        Configuration object containing the private key.
+    connection : web3_obj
+        web3 connection.
+    raw_txns : list
+        transactions built by build_contract_transaction.
+
+    Returns
+    -------
+    list
+        raw signed transaction bytes, in the order they were passed.
+
+    """
+    with ThreadPoolExecutor() as executor:
+        return list(executor.map(
+            functools.partial(sign_transaction, config, connection), raw_txns
+        ))
+
+
+async def _async_send_raw_transactions(rpc_url: str, signed_txns: list):
+    async with aiohttp.ClientSession() as session:
+        return await asyncio.gather(
+            *[
+                _async_rpc_request(
+                    session,
+                    rpc_url,
+                    "eth_sendRawTransaction",
+                    [Web3.to_hex(signed_txn)]
+                )
+                for signed_txn in signed_txns
+            ],
+            return_exceptions=True
+        )
+
+
+def send_raw_transactions(connection, signed_txns: list):
+    """
+    Send a list of signed transactions concurrently. If aiohttp is installed
+    they are posted over a single async session, otherwise each one is sent
+    from a thread pool.
+
+    Parameters
+    ----------
+    connection : web3_obj
+        web3 connection.
+    signed_txns : list
+        raw signed transaction bytes.
+
+    Returns
+    -------
+    list
+        transaction hash, or the raised exception, for each transaction in the
+        order they were passed.
+
+    """
+    rpc_url = None
+    if aiohttp is not None and isinstance(connection.provider, HTTPProvider):
+        rpc_url = connection.provider.endpoint_uri
+
+    # asyncio.run cannot be used from inside an already running event loop
+    try:
+        asyncio.get_running_loop()
+        rpc_url = None
+    except RuntimeError:
+        pass
+
+    if rpc_url is not None:
+        results = asyncio.run(_async_send_raw_transactions(rpc_url, signed_txns))
+        return [
+            result if isinstance(result, Exception) else HexBytes(result)
+            for result in results
+        ]
+
+    def send(signed_txn):
+        try:
+            return connection.eth.send_raw_transaction(signed_txn)
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor() as executor:
+        return list(executor.map(send, signed_txns))
+
+
 def create_hash(data_type_list: list, data_value_list: list):
     """
     Create a keccak hash using a list of strings corresponding to data types
@@ -696,8 +1575,7 @@ def save_json_file_to_datastore(filename: str, data: dict):
         filename
     )
 
-    with open(filepath, 'w') as f:
-        json.dump(data, f)
+    write_json_file(filepath, data)
 
 
 def make_timestamped_dataframe(data):
@@ -754,10 +1632,17 @@ def save_csv_to_datastore(filename: str, dataframe):
     )
 
 
+# Swap routes for the most recently used markets dict, keyed by
+# (in_token, out_token). Only one markets snapshot is held at a time.
+_swap_route_state = (None, {})
+
+
 def determine_swap_route(markets: dict, in_token: str, out_token: str):
     """
     Using the available markets, find the list of GMX markets required
-    to swap from token in to token out
+    to swap from token in to token out. Routes are cached for the most
+    recently passed markets dictionary, so a markets dictionary should not be
+    modified after it has been used for routing.
 
     Parameters
     ----------
@@ -776,6 +1661,28 @@ def determine_swap_route(markets: dict, in_token: str, out_token: str):
         requires more than one market to pass thru.
 
     """
+    global _swap_route_state
+
+    # A new markets dict replaces the cached routes, so stale snapshots are
+    # not kept alive
+    route_markets, routes = _swap_route_state
+    if route_markets is not markets:
+        routes = {}
+        _swap_route_state = (markets, routes)
+
+    cached = routes.get((in_token, out_token))
+    if cached is not None:
+        return list(cached[0]), cached[1]
+
+    swap_route, is_requires_multi_swap = _determine_swap_route(
+        markets, in_token, out_token
+    )
+    routes[(in_token, out_token)] = (swap_route, is_requires_multi_swap)
+
+    return list(swap_route), is_requires_multi_swap
+
+
+def _determine_swap_route(markets: dict, in_token: str, out_token: str):
 
     if in_token == "0x2f2a2543B76A4166549F7aaB2e75Bef0aefC5B0f":
         in_token = "0x47904963fc8b2340414262125aF798B9655E58Cd"
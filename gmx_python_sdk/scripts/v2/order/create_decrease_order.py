@@ -1,6 +1,10 @@
+import logging
+
 from .order import Order
 from ..gas_utils import get_gas_limits
-from ..gmx_utils import get_datastore_contract
+from ..gmx_utils import get_contract_object
+
+logger = logging.getLogger(__name__)
 
 
 class DecreaseOrder(Order):
@@ -19,13 +23,13 @@ class DecreaseOrder(Order):
         - *args: List of positional arguments to be passed to the base Order class.
         - **kwargs: Dictionary of keyword arguments to be passed to the base Order class.
         """
-        print("[DEBUG] Initializing DecreaseOrder with arguments and keyword arguments.")
+        logger.debug("Initializing DecreaseOrder with arguments and keyword arguments.")
         super().__init__(
             *args, **kwargs
         )
 
         # Build the order as a "close" order
-        print("[DEBUG] Building order as a 'close' order.")
+        logger.debug("Building order as a 'close' order.")
         self.order_builder(is_close=True)
 
     def determine_gas_limits(self):
@@ -35,16 +39,16 @@ class DecreaseOrder(Order):
         This method interacts with the GMX datastore to fetch appropriate
         gas limit settings for a decrease order.
         """
-        print("[DEBUG] Determining gas limits for the decrease order.")
+        logger.debug("Determining gas limits for the decrease order.")
         
         # Fetch the datastore contract
-        datastore = get_datastore_contract(self.config)
-        print(f"[DEBUG] Retrieved datastore contract: {datastore}")
+        datastore = get_contract_object(self._connection, 'datastore', self.config.chain)
+        logger.debug("Retrieved datastore contract: %s", datastore)
 
         # Fetch and store gas limits specific to decrease orders
         self._gas_limits = get_gas_limits(datastore)
-        print(f"[DEBUG] Gas limits fetched: {self._gas_limits}")
+        logger.debug("Gas limits fetched: %s", self._gas_limits)
 
         # Set the specific gas limit for decrease orders
         self._gas_limits_order_type = self._gas_limits["decrease_order"]
-        print(f"[DEBUG] Gas limit for 'decrease_order': {self._gas_limits_order_type}")
+        logger.debug("Gas limit for 'decrease_order': %s", self._gas_limits_order_type)
@@ -1,6 +1,10 @@
+import logging
+
 from .order import Order
 from ..gas_utils import get_gas_limits
-from ..gmx_utils import get_datastore_contract
+from ..gmx_utils import get_contract_object
+
+logger = logging.getLogger(__name__)
 
 
 class IncreaseOrder(Order):
@@ -23,15 +27,16 @@ class IncreaseOrder(Order):
         super().__init__(*args, **kwargs)
 
         # Debug: Log the initialization of an IncreaseOrder.
-        print("[DEBUG] IncreaseOrder initialized with the following parameters:")
-        for arg_name, arg_value in kwargs.items():
-            print(f"  - {arg_name}: {arg_value}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("IncreaseOrder initialized with the following parameters:")
+            for arg_name, arg_value in kwargs.items():
+                logger.debug("  - %s: %s", arg_name, arg_value)
 
         # Open an increase order.
         # The `order_builder` method prepares the order parameters to align with GMX's requirements.
-        print("[DEBUG] Calling order_builder to configure the increase order...")
+        logger.debug("Calling order_builder to configure the increase order...")
         self.order_builder(is_open=True)
-        print("[DEBUG] Increase order configured successfully.")
+        logger.debug("Increase order configured successfully.")
 
     def determine_gas_limits(self):
         """
@@ -40,15 +45,15 @@ class IncreaseOrder(Order):
         This method fetches the gas limits specific to the increase order type from GMX's data store.
         """
         # Fetch the datastore contract instance using the provided configuration.
-        print("[DEBUG] Fetching datastore contract to retrieve gas limits...")
-        datastore = get_datastore_contract(self.config)
-        print("[DEBUG] Datastore contract retrieved.")
+        logger.debug("Fetching datastore contract to retrieve gas limits...")
+        datastore = get_contract_object(self._connection, 'datastore', self.config.chain)
+        logger.debug("Datastore contract retrieved.")
 
         # Retrieve gas limits from the datastore.
-        print("[DEBUG] Retrieving gas limits for the increase order...")
+        logger.debug("Retrieving gas limits for the increase order...")
         self._gas_limits = get_gas_limits(datastore)
-        print(f"[DEBUG] Retrieved gas limits: {self._gas_limits}")
+        logger.debug("Retrieved gas limits: %s", self._gas_limits)
 
         # Extract the specific gas limit for the "increase_order" type.
         self._gas_limits_order_type = self._gas_limits["increase_order"]
-        print(f"[DEBUG] Gas limit for 'increase_order': {self._gas_limits_order_type}")
+        logger.debug("Gas limit for 'increase_order': %s", self._gas_limits_order_type)
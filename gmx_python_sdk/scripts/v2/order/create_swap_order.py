@@ -1,10 +1,9 @@
-from web3 import Web3
-
 from .order import Order
 from ..gas_utils import get_gas_limits
 from ..get.get_oracle_prices import OraclePrices
 from ..gmx_utils import (
-    get_estimated_swap_output, contract_map, get_datastore_contract
+    get_estimated_swap_output, contract_map, get_contract_object,
+    convert_to_checksum_address
 )
 
 
@@ -26,7 +25,7 @@ class SwapOrder(Order):
 
     def determine_gas_limits(self):
 
-        datastore = get_datastore_contract(self.config)
+        datastore = get_contract_object(self._connection, 'datastore', self.config.chain)
         self._gas_limits = get_gas_limits(datastore)
         self._gas_limits_order_type = self._gas_limits["swap_order"]
 
@@ -53,10 +52,7 @@ class SwapOrder(Order):
 
         prices = OraclePrices(chain=self.config.chain).get_recent_prices()
 
-        try:
-            in_token = Web3.to_checksum_address(in_token)
-        except AttributeError:
-            in_token = Web3.toChecksumAddress(in_token)
+        in_token = convert_to_checksum_address(self.config, in_token)
 
         # For every path we through we need to call this to get the expected
         # output after x number of swaps
@@ -1,20 +1,25 @@
+import logging
+
 import numpy as np
 from hexbytes import HexBytes
-from web3 import Web3
 from ..get.get_markets import Markets
 from ..get.get_oracle_prices import OraclePrices
 from ..gmx_utils import (
-    get_exchange_router_contract, create_connection, contract_map,
+    get_contract_object, create_connection, contract_map,
     PRECISION, get_execution_price_and_price_impact, order_type as order_types,
     decrease_position_swap_type as decrease_position_swap_types,
-    convert_to_checksum_address, check_web3_correct_version
+    convert_to_checksum_address, check_web3_correct_version,
+    build_contract_transaction, nonce_manager, sign_transactions, sign_and_send_transaction,
+    is_nonce_conflict_error, send_raw_transactions
 )
-from ..gas_utils import get_execution_fee
+from ..gas_utils import get_execution_fee, call_gas_limit, get_max_priority_fee
 from ..approve_token_for_spend import check_if_approved
 
+logger = logging.getLogger(__name__)
+
 is_newer_version, version = check_web3_correct_version()
 if is_newer_version:
-    print("[DEBUG] Warning: Current version of py web3 ({version}), may result in errors.")
+    logger.warning("Current version of py web3 (%s), may result in errors.", version)
 
 class Order:
     def __init__(
@@ -22,10 +27,18 @@ class Order:
         index_token_address: str, is_long: bool, size_delta: float,
         initial_collateral_delta_amount: str, slippage_percent: float,
         swap_path: list, max_fee_per_gas: int = None, auto_cancel: bool = False,
-        debug_mode: bool = False, execution_buffer: float = 1.3
+        debug_mode: bool = False, execution_buffer: float = 1.3,
+        defer_submission: bool = False
     ) -> None:
         """
         Initialize the Order class with all the parameters required for submitting a transaction.
+
+        With defer_submission the built transaction is held back rather than sent, so that it can
+        be submitted together with other orders through `Order.submit_many`.
+
+        debug_mode builds the transaction without sending it and does not change logging levels,
+        the build details are logged at DEBUG on the `gmx_python_sdk` loggers for the application
+        to enable.
         """
         self.config = config
         self.market_key = market_key
@@ -40,20 +53,48 @@ class Order:
         self.debug_mode = debug_mode  # Debug mode for testing without submission
         self.auto_cancel = auto_cancel  # Whether to auto-cancel the order
         self.execution_buffer = execution_buffer  # Buffer for execution fee
+        self.defer_submission = defer_submission  # Hold the transaction for submit_many
+        self._pending_submission = None
 
         if self.debug_mode:
-            print(f"[DEBUG] Execution buffer set to: {(self.execution_buffer - 1) * 100:.2f}%")
+            logger.debug("Execution buffer set to: %.2f%%", (self.execution_buffer - 1) * 100)
+
+        self._connection = create_connection(config)
 
         if self.max_fee_per_gas is None:
-            block = create_connection(config).eth.get_block('latest')
+            block = self._get_latest_block()
             self.max_fee_per_gas = block['baseFeePerGas'] * 1.35
-            print(f"[DEBUG] Max fee per gas dynamically set to: {self.max_fee_per_gas}")
+            logger.debug("Max fee per gas dynamically set to: %s", self.max_fee_per_gas)
 
-        self._exchange_router_contract_obj = get_exchange_router_contract(config=self.config)
-        self._connection = create_connection(config)
+        self._exchange_router_contract_obj = get_contract_object(
+            self._connection, 'exchangerouter', self.config.chain
+        )
         self._is_swap = False
 
-        print("[DEBUG] Creating order...")
+        logger.debug("Creating order...")
+
+    def _get_latest_block(self):
+        """
+        Fetch the latest block. When the installed web3 supports batch requests and the nonce
+        manager does not hold a nonce for the configured wallet yet, the wallet's pending
+        transaction count is read in the same JSON-RPC batch and handed to the nonce manager,
+        saving the round trip when the first order is submitted.
+        """
+        wallet_address = getattr(self.config, 'user_wallet_address', None)
+
+        if wallet_address is not None and hasattr(self._connection, 'batch_requests'):
+            wallet_address = convert_to_checksum_address(self.config, wallet_address)
+
+            if not nonce_manager.is_known(self._connection, wallet_address):
+                with self._connection.batch_requests() as batch:
+                    batch.add(self._connection.eth.get_block('latest'))
+                    batch.add(self._connection.eth.get_transaction_count(wallet_address, 'pending'))
+                    block, pending_count = batch.execute()
+                nonce_manager.prime(self._connection, wallet_address, pending_count)
+                return block
+
+        # Older web3 versions have no batching, the nonce is read when the order is submitted
+        return self._connection.eth.get_block('latest')
 
     def determine_gas_limits(self):
         """
@@ -66,7 +107,7 @@ class Order:
         Check if the collateral token is approved for spending by the contract and approve if necessary.
         """
         spender = contract_map[self.config.chain]["syntheticsrouter"]['contract_address']
-        print(f"[DEBUG] Checking approval for spender: {spender} on token: {self.collateral_address}")
+        logger.debug("Checking approval for spender: %s on token: %s", spender, self.collateral_address)
         
         check_if_approved(
             self.config,
@@ -76,57 +117,156 @@ class Order:
             self.max_fee_per_gas,
             approve=True
         )
-        print("[DEBUG] Approval check completed.")
+        logger.debug("Approval check completed.")
 
     def _submit_transaction(self, user_wallet_address: str, value_amount: float, multicall_args: list, gas_limits: dict):
         """
         Build and submit the transaction to the blockchain.
+
+        The transaction gas limit is set to twice the datastore gas limit for the order type, the
+        second multiple acting as a buffer.
         """
-        print("[DEBUG] Building transaction...")
-        try:
-            wallet_address = Web3.to_checksum_address(user_wallet_address)
-        except AttributeError:
-            wallet_address = Web3.toChecksumAddress(user_wallet_address)
+        logger.debug("Building transaction...")
+        wallet_address = convert_to_checksum_address(self.config, user_wallet_address)
 
-        print(f"[DEBUG] Wallet address: {wallet_address}")
-        
-        nonce = self._connection.eth.get_transaction_count(wallet_address)
-        print(f"[DEBUG] Nonce for transaction: {nonce}")
+        logger.debug("Wallet address: %s", wallet_address)
+
+        if self.defer_submission:
+            self._pending_submission = (wallet_address, value_amount, multicall_args)
+            logger.debug("Transaction deferred for submit_many")
+            return
+
+        nonce, = nonce_manager.next(self._connection, wallet_address)
+        logger.debug("Nonce for transaction: %s", nonce)
 
         try:
-            raw_txn = self._exchange_router_contract_obj.functions.multicall(multicall_args).build_transaction({
-                'value': value_amount,
-                'chainId': self.config.chain_id,
-                'gas': self._gas_limits_order_type.call() + self._gas_limits_order_type.call(),
-                'maxFeePerGas': int(self.max_fee_per_gas),
-                'maxPriorityFeePerGas': 0,
-                'nonce': nonce
-            })
-
-            print(f"[DEBUG] Raw transaction built: {raw_txn}")
-
-            if not self.debug_mode:
-                signed_txn = self._connection.eth.account.sign_transaction(raw_txn, self.config.private_key)
-                txn = signed_txn.rawTransaction if hasattr(signed_txn, 'rawTransaction') else signed_txn.raw_transaction
-                tx_hash = self._connection.eth.send_raw_transaction(txn)
-                
-                print(f"[DEBUG] Transaction submitted! Tx Hash: {tx_hash.hex()}")
-                print(f"[DEBUG] Check status at: https://arbiscan.io/tx/{tx_hash.hex()}")
+            raw_txn = self._build_transaction(value_amount, multicall_args, nonce)
+
+            if self.debug_mode:
+                # Nothing is sent, so hand the nonce back
+                nonce_manager.reset(self._connection, wallet_address)
+                return
+
+            try:
+                tx_hash = sign_and_send_transaction(self.config, self._connection, raw_txn)
+            except Exception as e:
+                if not is_nonce_conflict_error(e):
+                    raise
+
+                # The local nonce is behind the chain, e.g. the wallet sent a transaction from
+                # outside this process. Resync and retry once with a fresh nonce.
+                logger.warning("Nonce %s already used (%s), retrying with a fresh nonce", nonce, e)
+                nonce_manager.reset(self._connection, wallet_address)
+                nonce, = nonce_manager.next(self._connection, wallet_address)
+                raw_txn = self._build_transaction(value_amount, multicall_args, nonce)
+                tx_hash = sign_and_send_transaction(self.config, self._connection, raw_txn)
+
+            logger.info("Transaction submitted! Tx Hash: %s", tx_hash.hex())
+            logger.info("Check status at: https://arbiscan.io/tx/%s", tx_hash.hex())
 
         except Exception as e:
-            print(f"[ERROR] Failed to submit transaction: {e}")
+            # Any failure leaves a gap at this nonce, resync with the node next time
+            nonce_manager.reset(self._connection, wallet_address)
+            logger.error("Failed to submit transaction: %s", e)
+
+    def _build_transaction(self, value_amount: float, multicall_args: list, nonce: int):
+        """
+        Build the exchange router multicall transaction for this order.
+        """
+        raw_txn = build_contract_transaction(
+            self.config,
+            self._exchange_router_contract_obj.functions.multicall(multicall_args),
+            value=value_amount,
+            gas=call_gas_limit(self._gas_limits_order_type) * 2,
+            max_fee_per_gas=self.max_fee_per_gas,
+            max_priority_fee_per_gas=get_max_priority_fee(self._connection),
+            nonce=nonce
+        )
+
+        # Only the selector and length of the multicall calldata are logged, the full hex can be KBs
+        logger.debug(
+            "Raw transaction built: nonce=%s gas=%s value=%s selector=%s data_len=%d",
+            raw_txn['nonce'], raw_txn['gas'], raw_txn['value'],
+            raw_txn['data'][:10], len(raw_txn['data'])
+        )
+
+        return raw_txn
+
+    @staticmethod
+    def submit_many(orders: list):
+        """
+        Submit orders created with defer_submission in one go. Nonces are reserved up front, the
+        transactions are signed in a thread pool and then all sent concurrently, so the total time
+        is roughly that of the slowest request rather than the sum of them.
+
+        Orders must share a config and wallet. Returns the transaction hash of each order, in the
+        order they were passed, or None where the order had nothing to submit or submission failed.
+        """
+        tx_hashes = [None] * len(orders)
+        pending = [
+            (i, order) for i, order in enumerate(orders) if order._pending_submission is not None
+        ]
+        if not pending:
+            return tx_hashes
+
+        config = pending[0][1].config
+        connection = pending[0][1]._connection
+        wallet_address = pending[0][1]._pending_submission[0]
+
+        # Every transaction is signed with the first order's private key
+        for _, order in pending:
+            if (
+                (order.config.chain, order.config.rpc, order.config.private_key)
+                != (config.chain, config.rpc, config.private_key)
+                or order._pending_submission[0] != wallet_address
+            ):
+                raise Exception("Orders submitted together must share a config and wallet!")
+
+        nonces = nonce_manager.next(connection, wallet_address, len(pending))
+
+        try:
+            raw_txns = [
+                order._build_transaction(
+                    order._pending_submission[1], order._pending_submission[2], nonce
+                )
+                for (_, order), nonce in zip(pending, nonces)
+            ]
+
+            if any(order.debug_mode for _, order in pending):
+                # Nothing is sent, so hand the nonces back
+                nonce_manager.reset(connection, wallet_address)
+                return tx_hashes
+
+            signed_txns = sign_transactions(config, connection, raw_txns)
+        except Exception:
+            nonce_manager.reset(connection, wallet_address)
+            raise
+
+        results = send_raw_transactions(connection, signed_txns)
+
+        for (i, order), result in zip(pending, results):
+            order._pending_submission = None
+            if isinstance(result, Exception):
+                # A failed transaction leaves a nonce gap, resync with the node next time
+                nonce_manager.reset(connection, wallet_address)
+                logger.error("Failed to submit transaction: %s", result)
+            else:
+                logger.info("Transaction submitted! Tx Hash: %s", result.hex())
+                tx_hashes[i] = result
+
+        return tx_hashes
 
     def _get_prices(self, decimals: float, prices: float, is_open: bool = False, is_close: bool = False, is_swap: bool = False):
         """
         Fetch and calculate token prices including slippage and acceptable price range.
         """
-        print("[DEBUG] Getting prices...")
+        logger.debug("Getting prices...")
         try:
-            price = np.median([
-                float(prices[self.index_token_address]['maxPriceFull']),
-                float(prices[self.index_token_address]['minPriceFull'])
-            ])
-            print(f"[DEBUG] Median price: {price}")
+            # Median of the max and min price, which for two values is their mean
+            max_price = float(prices[self.index_token_address]['maxPriceFull'])
+            min_price = float(prices[self.index_token_address]['minPriceFull'])
+            price = (max_price + min_price) * 0.5
+            logger.debug("Median price: %s", price)
 
             if is_open:
                 slippage = price * (1 + self.slippage_percent) if self.is_long else price * (1 - self.slippage_percent)
@@ -135,13 +275,51 @@ class Order:
             else:
                 slippage = 0
             
-            print(f"[DEBUG] Slippage-adjusted price: {slippage}")
+            logger.debug("Slippage-adjusted price: %s", slippage)
 
             acceptable_price_in_usd = int(slippage) * 10 ** (decimals - PRECISION)
-            print(f"[DEBUG] Acceptable price in USD (scaled): {acceptable_price_in_usd}")
+            logger.debug("Acceptable price in USD (scaled): %s", acceptable_price_in_usd)
 
             return price, int(slippage), acceptable_price_in_usd
 
         except Exception as e:
-            print(f"[ERROR] Error while getting prices: {e}")
+            logger.error("Error while getting prices: %s", e)
             raise
+
+    @staticmethod
+    def batch_get_prices(
+        prices: dict, index_token_addresses: list, is_long, slippage_percent, decimals,
+        is_open: bool = False, is_close: bool = False
+    ):
+        """
+        Vectorised version of `_get_prices` for building many orders at once. `is_long`,
+        `slippage_percent` and `decimals` may be scalars or sequences aligned with
+        `index_token_addresses`.
+
+        Returns arrays of the median price, the slippage adjusted price (truncated to a whole
+        number) and the acceptable price, in the same order as `index_token_addresses`.
+        """
+        max_prices = np.fromiter(
+            (float(prices[address]['maxPriceFull']) for address in index_token_addresses),
+            dtype=np.float64, count=len(index_token_addresses)
+        )
+        min_prices = np.fromiter(
+            (float(prices[address]['minPriceFull']) for address in index_token_addresses),
+            dtype=np.float64, count=len(index_token_addresses)
+        )
+        price = (max_prices + min_prices) * 0.5
+
+        if is_open or is_close:
+            # Longs accept a higher price on open and a lower one on close, shorts the reverse
+            direction = np.where(np.asarray(is_long), 1.0, -1.0) * (1.0 if is_open else -1.0)
+            slippage = np.trunc(price * (1 + direction * np.asarray(slippage_percent, dtype=np.float64)))
+        else:
+            slippage = np.zeros_like(price)
+
+        # Prices are too large for int64, so the decimal scaling is done in float64 as in
+        # `_get_prices`
+        acceptable_price_in_usd = slippage * np.power(
+            10.0, np.asarray(decimals, dtype=np.float64) - PRECISION
+        )
+
+        return price, slippage, acceptable_price_in_usd
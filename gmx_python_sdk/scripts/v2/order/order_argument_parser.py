@@ -1,12 +1,132 @@
-import numpy as np
+import functools
+import logging
+
+from decimal import Decimal
+from types import MappingProxyType
 
 from ..get.get_oracle_prices import OraclePrices
 from ..get.get_markets import Markets
-from ..gmx_utils import get_tokens_address_dict, determine_swap_route
+from ..gmx_utils import (
+    get_tokens_address_dict, get_symbol_to_address, determine_swap_route, convert_to_checksum_address
+)
+
+# Powers of ten for decimal scaling, token decimals and the 30 decimal USD precision index into it
+_POW10 = tuple(10**i for i in range(64))
+
+logger = logging.getLogger(__name__)
+
+
+def _scale_amount(amount, decimals: int):
+    """
+    Scale a token or USD amount to an integer number of base units, truncating any remainder.
+    The amount may be a float, int, str or Decimal, going through its string form means a float
+    such as 0.1 is scaled as written rather than from its binary approximation. The scaling
+    shifts the decimal exponent, so it is exact however many digits the amount has.
+    """
+    sign, digits, exponent = Decimal(str(amount)).as_tuple()
+    return int(Decimal((sign, digits, exponent + decimals)))
+
+
+@functools.lru_cache(maxsize=None)
+def _make_formatter(is_swap: bool, decimals: int):
+    """
+    Build the function that scales a parameters dictionary's size and collateral amounts for
+    on-chain use, with the decimals for the order type and start token fixed.
+    """
+    if is_swap:
+        def format_size_info(parameters_dict):
+            parameters_dict["initial_collateral_delta"] = _scale_amount(
+                parameters_dict["initial_collateral_delta"], decimals
+            )
+        return format_size_info
+
+    def format_size_info(parameters_dict):
+        parameters_dict["size_delta"] = _scale_amount(parameters_dict["size_delta_usd"], 30)
+        parameters_dict["initial_collateral_delta"] = _scale_amount(
+            parameters_dict["initial_collateral_delta"], decimals
+        )
+    return format_size_info
+
+
+# Token address keys normalised to checksum form on entry, so token and price lookups hit first time
+_ADDRESS_KEYS = ("index_token_address", "start_token_address", "collateral_address", "out_token_address")
+
+# Symbols and index token addresses that are looked up under another name, BTC is traded
+# through WBTC.b
+_SYMBOL_ALIASES = {'BTC': 'WBTC.b'}
+_INDEX_TOKEN_ALIASES = {
+    '0x2f2a2543B76A4166549F7aaB2e75Bef0aefC5B0f': '0x47904963fc8b2340414262125aF798B9655E58Cd'
+}
+
+# Keys each order type needs, anything missing is filled in by the missing key handlers
+_REQUIRED_INCREASE = frozenset({
+    "chain",
+    "index_token_address",
+    "market_key",
+    "start_token_address",
+    "collateral_address",
+    "swap_path",
+    "is_long",
+    "size_delta_usd",
+    "initial_collateral_delta",
+    "slippage_percent"
+})
+_REQUIRED_DECREASE = frozenset({
+    "chain",
+    "index_token_address",
+    "market_key",
+    "start_token_address",
+    "collateral_address",
+    "is_long",
+    "size_delta_usd",
+    "initial_collateral_delta",
+    "slippage_percent"
+})
+_REQUIRED_SWAP = frozenset({
+    "chain",
+    "start_token_address",
+    "out_token_address",
+    "initial_collateral_delta",
+    "swap_path",
+    "slippage_percent"
+})
+
+
+def _select_handlers(handlers, required_keys):
+    """
+    Return the missing key handlers for the keys in required_keys, keeping their order.
+    """
+    return MappingProxyType({
+        key: handler_name for key, handler_name in handlers.items() if key in required_keys
+    })
 
 
 class OrderArgumentParser:
 
+    __slots__ = (
+        'config', 'parameters_dict', 'is_increase', 'is_decrease', 'is_swap', 'markets',
+        'required_keys', '_market_by_index', '_tokens', '_prices', '_start_token_meta',
+        '_oracle_factor_pow', '_handlers'
+    )
+
+    # Missing key handler method names, in the order they are run
+    _HANDLERS = MappingProxyType({
+        "chain": "_handle_missing_chain",
+        "index_token_address": "_handle_missing_index_token_address",
+        "market_key": "_handle_missing_market_key",
+        "start_token_address": "_handle_missing_start_token_address",
+        "out_token_address": "_handle_missing_out_token_address",
+        "collateral_address": "_handle_missing_collateral_address",
+        "swap_path": "_handle_missing_swap_path",
+        "is_long": "_handle_missing_is_long",
+        "slippage_percent": "_handle_missing_slippage_percent"
+    })
+
+    # Only the handlers for keys each order type requires
+    _HANDLERS_INCREASE = _select_handlers(_HANDLERS, _REQUIRED_INCREASE)
+    _HANDLERS_DECREASE = _select_handlers(_HANDLERS, _REQUIRED_DECREASE)
+    _HANDLERS_SWAP = _select_handlers(_HANDLERS, _REQUIRED_SWAP)
+
     def __init__(self, config, is_increase: bool = False, is_decrease: bool = False, is_swap: bool = False):
         """
         Initialize the parser with configuration and order type (increase, decrease, or swap).
@@ -26,54 +146,31 @@ class OrderArgumentParser:
         # Fetch market information
         self.markets = Markets(config).info
 
-        # Define required keys based on the order type
+        # Reverse lookup from index token address to market key, the first listed market wins
+        self._market_by_index = {}
+        for market_key, market in self.markets.items():
+            self._market_by_index.setdefault(market['index_token_address'], market_key)
+
+        # Token list for the chain, looked up once and shared by every handler
+        self._tokens = get_tokens_address_dict(config.chain)
+
+        # Oracle prices for the dictionary being processed, fetched at most once per call
+        self._prices = None
+
+        # Start token entry and its oracle price scaling factor, set once the start token is known
+        self._start_token_meta = None
+        self._oracle_factor_pow = None
+
+        # Required keys and missing key handlers for the order type
         if is_increase:
-            self.required_keys = [
-                "chain",
-                "index_token_address",
-                "market_key",
-                "start_token_address",
-                "collateral_address",
-                "swap_path",
-                "is_long",
-                "size_delta_usd",
-                "initial_collateral_delta",
-                "slippage_percent"
-            ]
+            self.required_keys = _REQUIRED_INCREASE
+            self._handlers = self._HANDLERS_INCREASE
         elif is_decrease:
-            self.required_keys = [
-                "chain",
-                "index_token_address",
-                "market_key",
-                "start_token_address",
-                "collateral_address",
-                "is_long",
-                "size_delta_usd",
-                "initial_collateral_delta",
-                "slippage_percent"
-            ]
+            self.required_keys = _REQUIRED_DECREASE
+            self._handlers = self._HANDLERS_DECREASE
         elif is_swap:
-            self.required_keys = [
-                "chain",
-                "start_token_address",
-                "out_token_address",
-                "initial_collateral_delta",
-                "swap_path",
-                "slippage_percent"
-            ]
-
-        # Mapping missing key handlers to their respective methods
-        self.missing_base_key_methods = {
-            "chain": self._handle_missing_chain,
-            "index_token_address": self._handle_missing_index_token_address,
-            "market_key": self._handle_missing_market_key,
-            "start_token_address": self._handle_missing_start_token_address,
-            "out_token_address": self._handle_missing_out_token_address,
-            "collateral_address": self._handle_missing_collateral_address,
-            "swap_path": self._handle_missing_swap_path,
-            "is_long": self._handle_missing_is_long,
-            "slippage_percent": self._handle_missing_slippage_percent
-        }
+            self.required_keys = _REQUIRED_SWAP
+            self._handlers = self._HANDLERS_SWAP
 
     def process_parameters_dictionary(self, parameters_dict):
         """
@@ -83,20 +180,47 @@ class OrderArgumentParser:
         Parameters:
         - parameters_dict: User-supplied dictionary of parameters for the order.
         """
-        print("[DEBUG] Processing parameters dictionary...")
-        print(f"[DEBUG] Initial parameters: {parameters_dict}")
+        return self._process_parameters_dictionary(parameters_dict)
+
+    def _process_parameters_dictionary(self, parameters_dict, prices: dict = None):
+        """
+        Process a parameters dictionary, using prices if given, otherwise fetching oracle prices
+        when they are needed.
+        """
+        # Prices are never carried over from a previous call, so a reused parser does not check
+        # collateral against stale prices
+        self._prices = prices
+
+        logger.debug("Processing parameters dictionary...")
+        logger.debug("Initial parameters: %s", parameters_dict)
 
         # Identify missing keys from the user-supplied dictionary
         missing_keys = self._determine_missing_keys(parameters_dict)
-        print(f"[DEBUG] Missing keys: {missing_keys}")
+        logger.debug("Missing keys: %s", missing_keys)
 
         self.parameters_dict = parameters_dict
 
-        # Handle missing keys using their respective methods
-        for missing_key in missing_keys:
-            if missing_key in self.missing_base_key_methods:
-                print(f"[DEBUG] Handling missing key: {missing_key}")
-                self.missing_base_key_methods[missing_key]()
+        for address_key in _ADDRESS_KEYS:
+            if address_key in parameters_dict:
+                parameters_dict[address_key] = convert_to_checksum_address(
+                    self.config, parameters_dict[address_key]
+                )
+
+        # Handle missing keys using their respective methods. The handlers are run in the order
+        # they are listed, as later ones depend on earlier ones (market key from index token).
+        # A fully specified dictionary skips the handler table altogether.
+        if missing_keys:
+            for missing_key, handler_name in self._handlers.items():
+                if missing_key in missing_keys:
+                    logger.debug("Handling missing key: %s", missing_key)
+                    getattr(self, handler_name)()
+
+        start_token_address = self.parameters_dict['start_token_address']
+        if start_token_address not in self._tokens:
+            raise Exception('"{}" not a known token for GMX v2!'.format(start_token_address))
+
+        self._start_token_meta = self._tokens[start_token_address]
+        self._oracle_factor_pow = _POW10[self._start_token_meta['decimals']] / _POW10[30]
 
         # Calculate position size or leverage if not provided (non-swap orders)
         if not self.is_swap:
@@ -105,17 +229,64 @@ class OrderArgumentParser:
 
         # Ensure minimum collateral requirements for increase orders
         if self.is_increase:
+            if self._prices is None:
+                self._prices = OraclePrices(chain=self.parameters_dict['chain']).get_recent_prices()
+
             initial_collateral_usd = self._calculate_initial_collateral_usd()
-            print(f"[DEBUG] Initial collateral in USD: {initial_collateral_usd}")
+            logger.debug("Initial collateral in USD: %s", initial_collateral_usd)
             if initial_collateral_usd < 2:
                 raise Exception("Position size must be backed by >$2 of collateral!")
 
         # Format size and collateral values for on-chain compatibility
         self._format_size_info()
-        print(f"[DEBUG] Final processed parameters: {self.parameters_dict}")
+        logger.debug("Final processed parameters: %s", self.parameters_dict)
 
         return self.parameters_dict
 
+    @classmethod
+    def process_batch(cls, config, parameters_dicts: list, kind: str):
+        """
+        Process several parameters dictionaries of the same order type. Markets, tokens and, for
+        increase orders, oracle prices are fetched once for config.chain and shared by every
+        dictionary, so every dictionary must be for that chain.
+
+        Parameters:
+        - config: Configuration object for GMX.
+        - parameters_dicts: List of user-supplied parameter dictionaries.
+        - kind: Order type, one of "increase", "decrease" or "swap".
+
+        Returns:
+        - A list of the processed parameter dictionaries.
+        """
+        if kind not in ("increase", "decrease", "swap"):
+            raise Exception('Order kind must be "increase", "decrease" or "swap", not "{}"!'.format(kind))
+
+        for parameters_dict in parameters_dicts:
+            chain = parameters_dict.get('chain', config.chain)
+            if chain != config.chain:
+                raise Exception(
+                    'Batch is for chain "{}", got a parameters dictionary for "{}"!'.format(
+                        config.chain, chain
+                    )
+                )
+
+        parser = cls(
+            config,
+            is_increase=kind == "increase",
+            is_decrease=kind == "decrease",
+            is_swap=kind == "swap"
+        )
+
+        # Only increase orders check collateral against oracle prices
+        prices = None
+        if kind == "increase":
+            prices = OraclePrices(chain=config.chain).get_recent_prices()
+
+        return [
+            parser._process_parameters_dictionary(parameters_dict, prices)
+            for parameters_dict in parameters_dicts
+        ]
+
     def _determine_missing_keys(self, parameters_dict):
         """
         Identify keys that are required but missing from the provided parameters dictionary.
@@ -124,10 +295,10 @@ class OrderArgumentParser:
         - parameters_dict: User-supplied parameters for the order.
 
         Returns:
-        - A list of missing keys.
+        - A set of missing keys.
         """
-        print("[DEBUG] Determining missing keys...")
-        return [key for key in self.required_keys if key not in parameters_dict]
+        logger.debug("Determining missing keys...")
+        return self.required_keys - parameters_dict.keys()
 
     def _handle_missing_chain(self):
         """
@@ -139,39 +310,34 @@ class OrderArgumentParser:
         """
         Handle a missing index token address by deriving it from the token symbol.
         """
-        try:
-            token_symbol = self.parameters_dict['index_token_symbol']
-            if token_symbol == "BTC":  # Exception for BTC ticker
-                token_symbol = "WBTC.b"
-        except KeyError:
+        token_symbol = self.parameters_dict.get('index_token_symbol')
+        if token_symbol is None:
             raise Exception("Index Token Address and Symbol not provided!")
+        token_symbol = _SYMBOL_ALIASES.get(token_symbol, token_symbol)
 
         # Look up the address based on the token symbol
-        self.parameters_dict['index_token_address'] = self.find_key_by_symbol(
-            get_tokens_address_dict(self.parameters_dict['chain']),
-            token_symbol
-        )
-        print(f"[DEBUG] Derived index token address: {self.parameters_dict['index_token_address']}")
+        index_token_address = get_symbol_to_address(self.parameters_dict['chain']).get(token_symbol)
+        if index_token_address is None:
+            raise Exception('"{}" not a known token for GMX v2!'.format(token_symbol))
+        self.parameters_dict['index_token_address'] = index_token_address
+        logger.debug("Derived index token address: %s", self.parameters_dict['index_token_address'])
 
     def _handle_missing_market_key(self):
         """
         Handle a missing market key by deriving it from the index token address.
         """
         index_token_address = self.parameters_dict['index_token_address']
-
-        # Exception handling for specific addresses
-        if index_token_address == "0x2f2a2543B76A4166549F7aaB2e75Bef0aefC5B0f":
-            index_token_address = "0x47904963fc8b2340414262125aF798B9655E58Cd"
+        index_token_address = _INDEX_TOKEN_ALIASES.get(index_token_address, index_token_address)
 
         # Derive the market key from the index token address
-        self.parameters_dict['market_key'] = self.find_market_key_by_index_address(
-            self.markets,
-            index_token_address
-        )
-        print(f"[DEBUG] Derived market key: {self.parameters_dict['market_key']}")
+        market_key = self._market_by_index.get(index_token_address)
+        if market_key is None:
+            raise Exception('No GMX v2 market found for index token "{}"!'.format(index_token_address))
+        self.parameters_dict['market_key'] = market_key
+        logger.debug("Derived market key: %s", self.parameters_dict['market_key'])
 
     # Similar methods (_handle_missing_start_token_address, _handle_missing_swap_path, etc.)
-    # would include debug statements to print intermediate results.
+    # would include debug logging of intermediate results.
 
     def _calculate_initial_collateral_usd(self):
         """
@@ -180,39 +346,29 @@ class OrderArgumentParser:
         Returns:
         - The USD value of the initial collateral.
         """
-        initial_collateral_delta_amount = self.parameters_dict['initial_collateral_delta']
-        prices = OraclePrices(chain=self.parameters_dict['chain']).get_recent_prices()
+        initial_collateral_delta_amount = float(self.parameters_dict['initial_collateral_delta'])
+        start_token_address = self.parameters_dict["start_token_address"]
+        if start_token_address not in self._prices:
+            raise Exception('No oracle price for start token "{}"!'.format(start_token_address))
 
-        # Get the median price for the collateral token
-        price = np.median([
-            float(prices[self.parameters_dict["start_token_address"]]['maxPriceFull']),
-            float(prices[self.parameters_dict["start_token_address"]]['minPriceFull'])
-        ])
+        # Median of the max and min price for the collateral token, which for two values is their mean
+        start_token_price = self._prices[start_token_address]
+        max_price = float(start_token_price['maxPriceFull'])
+        min_price = float(start_token_price['minPriceFull'])
+        price = (max_price + min_price) * 0.5
 
         # Adjust for token decimals
-        oracle_factor = get_tokens_address_dict(
-            self.parameters_dict['chain']
-        )[self.parameters_dict["start_token_address"]]['decimals'] - 30
-        price = price * 10 ** oracle_factor
+        price = price * self._oracle_factor_pow
 
         collateral_usd = price * initial_collateral_delta_amount
-        print(f"[DEBUG] Calculated initial collateral USD: {collateral_usd}")
+        logger.debug("Calculated initial collateral USD: %s", collateral_usd)
         return collateral_usd
 
     def _format_size_info(self):
         """
         Format `size_delta` and `initial_collateral_delta` for on-chain compatibility.
         """
-        print("[DEBUG] Formatting size information for on-chain compatibility...")
-        if not self.is_swap:
-            self.parameters_dict["size_delta"] = int(
-                self.parameters_dict["size_delta_usd"] * 10**30
-            )
-        decimal = get_tokens_address_dict(
-            self.parameters_dict['chain']
-        )[self.parameters_dict["start_token_address"]]['decimals']
-        self.parameters_dict["initial_collateral_delta"] = int(
-            self.parameters_dict["initial_collateral_delta"] * 10**decimal
-        )
-        print(f"[DEBUG] Formatted size_delta: {self.parameters_dict['size_delta']}")
-        print(f"[DEBUG] Formatted initial_collateral_delta: {self.parameters_dict['initial_collateral_delta']}")
+        logger.debug("Formatting size information for on-chain compatibility...")
+        _make_formatter(self.is_swap, self._start_token_meta['decimals'])(self.parameters_dict)
+        logger.debug("Formatted size_delta: %s", self.parameters_dict.get('size_delta'))
+        logger.debug("Formatted initial_collateral_delta: %s", self.parameters_dict['initial_collateral_delta'])
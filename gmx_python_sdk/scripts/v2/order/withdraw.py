@@ -10,7 +10,8 @@ from ..get.get_oracle_prices import OraclePrices
 from ..gmx_utils import convert_to_checksum_address, \
     get_exchange_router_contract, create_connection, \
     determine_swap_route, contract_map, \
-    get_estimated_withdrawal_amount_out, check_web3_correct_version
+    get_estimated_withdrawal_amount_out, check_web3_correct_version, RAW_TRANSACTION_ATTR, \
+    nonce_manager
 
 from ..approve_token_for_spend import check_if_approved
 
@@ -92,10 +93,33 @@ class Withdraw:
         """
         self.log.info("Building transaction...")
 
-        nonce = self._connection.eth.get_transaction_count(
-            user_wallet_address
+        user_wallet_address = convert_to_checksum_address(
+            self.config, user_wallet_address
         )
 
+        # Shared with order submission so transactions from one wallet do not
+        # reuse a nonce
+        nonce, = nonce_manager.next(self._connection, user_wallet_address)
+
+        try:
+            self._build_and_send_transaction(
+                value_amount, multicall_args, nonce
+            )
+        except Exception:
+            nonce_manager.reset(self._connection, user_wallet_address)
+            raise
+
+        if self.debug_mode:
+            # Nothing was sent, so hand the nonce back
+            nonce_manager.reset(self._connection, user_wallet_address)
+
+    def _build_and_send_transaction(
+        self, value_amount: float, multicall_args: list, nonce: int
+    ):
+        """
+        Build the multicall transaction with the given nonce, then sign and
+        send it unless in debug mode
+        """
         raw_txn = self._exchange_router_contract_obj.functions.multicall(
             multicall_args
         ).build_transaction(
@@ -118,10 +142,7 @@ class Withdraw:
                 raw_txn, self.config.private_key
             )
 
-            try:
-                txn = signed_txn.rawTransaction
-            except TypeError:
-                txn = signed_txn.raw_transaction
+            txn = getattr(signed_txn, RAW_TRANSACTION_ATTR)
 
             tx_hash = self._connection.eth.send_raw_transaction(
                 txn